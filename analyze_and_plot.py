@@ -0,0 +1,170 @@
+"""
+analyze_and_plot.py
+-------------------
+Visualization tool: estimates CO₂ for recorded experiment runs and plots
+regional comparisons plus historical carbon-intensity trends.
+"""
+
+import os
+import argparse
+import pandas as pd
+import numpy as np
+import matplotlib
+if not os.environ.get("DISPLAY"):
+    matplotlib.use("Agg")  # headless (Docker/CI): skip GUI backend init
+import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
+
+from estimator import estimate_co2_vec
+
+# Optional Arrow formats (Feather cache, Parquet mirror) - skips text
+# serialization entirely on repeat runs
+try:
+    import pyarrow  # noqa: F401
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+DATA_DIR = "Data"
+OUTPUT_DIR = "analysis_plots"
+REGIONS = ["Northern", "Western", "Southern", "Eastern"]
+
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+parser = argparse.ArgumentParser(description="Estimate CO₂ for recorded runs and plot trends")
+parser.add_argument("--csv", action="store_true",
+                    help="also export the enriched results as CSV")
+args = parser.parse_args()
+
+# ---------------------------------------------------------------------
+# Step 1. Load experiment results
+# ---------------------------------------------------------------------
+
+results_file = os.path.join(DATA_DIR, "results.csv")
+if not os.path.exists(results_file):
+    raise FileNotFoundError(f"Could not find {results_file} - run experiments first")
+
+# Float32 metrics and a categorical region keep the frame compact
+DTYPES = {"duration_s": "float32", "cpu_time_s": "float32",
+          "workload_scale": "int32", "region": "category"}
+
+# ---------------------------------------------------------------------
+# Step 2. Estimate CO₂ for every run (vectorized over the whole frame)
+# ---------------------------------------------------------------------
+
+if ARROW_AVAILABLE:
+    enriched_file = os.path.join(DATA_DIR, "results_with_co2.feather")
+else:
+    enriched_file = os.path.join(DATA_DIR, "results_with_co2.csv")
+
+if (os.path.exists(enriched_file)
+        and os.path.getmtime(enriched_file) >= os.path.getmtime(results_file)):
+    # Enriched results are newer than the raw log - skip the estimate pass
+    if ARROW_AVAILABLE:
+        df = pd.read_feather(enriched_file)
+    else:
+        df = pd.read_csv(enriched_file, dtype=DTYPES)
+    print(f"✅ Reusing cached enriched results ({len(df)} records): {enriched_file}")
+else:
+    df = pd.read_csv(results_file, dtype=DTYPES)
+    print(f"✅ Loaded {len(df)} experiment records")
+
+    # One call over contiguous arrays; CI is fetched once per unique region
+    df["energy_kwh"], df["co2_g"] = estimate_co2_vec(
+        df["duration_s"].to_numpy(),
+        df["region"].to_numpy(),
+        mode="hybrid",
+    )
+    if ARROW_AVAILABLE:
+        # Feather roundtrips dtypes losslessly and skips float-to-string work
+        df.to_feather(enriched_file)
+    else:
+        df.to_csv(enriched_file, index=False)
+    print(f"✅ Saved enriched results: {enriched_file}")
+
+if args.csv and ARROW_AVAILABLE:
+    csv_export = os.path.join(DATA_DIR, "results_with_co2.csv")
+    df.to_csv(csv_export, index=False)
+    print(f"📁 Exported CSV copy: {csv_export}")
+
+# ---------------------------------------------------------------------
+# Step 3. CO₂ comparison across regions
+# ---------------------------------------------------------------------
+
+region_co2 = df.groupby("region")["co2_g"].mean().reindex(REGIONS)
+
+plt.figure(figsize=(10, 6))
+plt.bar(region_co2.index, region_co2.values, color="#4ecdc4", alpha=0.8)
+plt.xlabel("Region")
+plt.ylabel("Mean CO₂ per run (g)")
+plt.title("Average CO₂ Emissions by Region")
+plt.grid(True, axis="y", alpha=0.3)
+plt.tight_layout()
+
+co2_plot = os.path.join(OUTPUT_DIR, "region_co2_comparison.png")
+plt.savefig(co2_plot)
+print(f"🖼️ Saved plot: {co2_plot}")
+
+# ---------------------------------------------------------------------
+# Step 4. Historical carbon-intensity trends
+# ---------------------------------------------------------------------
+
+def load_historical(region):
+    """Read one region's historical CI series (None if missing).
+
+    Prefers a Parquet mirror of the CSV (built on first use, refreshed
+    when the CSV is newer) so repeat runs read binary columnar data with
+    column pushdown instead of re-parsing text and dates.
+    """
+    csv_file = os.path.join(DATA_DIR, f"{region}.csv")
+    pq_file = os.path.join(DATA_DIR, f"{region}.parquet")
+    if ARROW_AVAILABLE:
+        stale = (not os.path.exists(pq_file) or
+                 (os.path.exists(csv_file) and
+                  os.path.getmtime(pq_file) < os.path.getmtime(csv_file)))
+        if stale and os.path.exists(csv_file):
+            pd.read_csv(csv_file, parse_dates=["timestamp"]).to_parquet(
+                pq_file, engine="pyarrow", compression="zstd")
+        if os.path.exists(pq_file):
+            return pd.read_parquet(
+                pq_file, columns=["timestamp", "carbon_intensity"],
+                engine="pyarrow")
+    if not os.path.exists(csv_file):
+        return None
+    return pd.read_csv(
+        csv_file,
+        usecols=["timestamp", "carbon_intensity"],
+        parse_dates=["timestamp"],
+        dtype={"carbon_intensity": "float32"},
+        engine="c",
+    )
+
+# Read the four regional files in parallel - pandas releases the GIL
+# during CSV parsing, so the reads overlap almost linearly
+with ThreadPoolExecutor(max_workers=4) as ex:
+    historical = dict(zip(REGIONS, ex.map(load_historical, REGIONS)))
+
+plt.figure(figsize=(10, 6))
+for region in REGIONS:
+    hist = historical[region]
+    if hist is None:
+        print(f"⚠️ Missing historical data for {region}, skipping")
+        continue
+    plt.plot(hist["timestamp"], hist["carbon_intensity"], label=region, alpha=0.8)
+
+plt.xlabel("Time")
+plt.ylabel("Carbon Intensity (gCO₂/kWh)")
+plt.title("Historical Carbon Intensity by Region")
+plt.legend()
+plt.grid(True, alpha=0.3)
+plt.tight_layout()
+
+trend_plot = os.path.join(OUTPUT_DIR, "ci_historical_trends.png")
+plt.savefig(trend_plot)
+if os.environ.get("DISPLAY"):
+    plt.show()
+else:
+    plt.close("all")
+
+print(f"🖼️ Saved plot: {trend_plot}")
+print("\n✅ Analysis complete.")
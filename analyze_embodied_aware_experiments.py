@@ -0,0 +1,279 @@
+"""
+analyze_embodied_aware_experiments.py
+=====================================
+Analyzes results from run_experiments_embodied_aware.py.
+
+Compares scheduling strategies on total / operational / embodied carbon,
+examines workload-scale impact and server-age selection, and generates a
+summary dashboard plus a text report.
+"""
+
+import argparse
+import os
+import sys
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+sns.set_style("whitegrid")
+
+RESULTS_FILE = os.path.join("experiment_results", "embodied_aware_experiments.csv")
+OUTPUT_DIR = "experiment_results"
+
+
+def load_results(path=RESULTS_FILE):
+    """Load the experiment log written by run_experiments_embodied_aware.py."""
+    if not os.path.exists(path):
+        print(f"❌ No results found at {path} - run run_experiments_embodied_aware.py first")
+        sys.exit(1)
+    # Downcast at load: categorical keys + float32 metrics halve the bytes
+    # every groupby and mask moves
+    dtypes = {"strategy": "category", "region": "category",
+              "server_age": "category", "workload_scale": "int32",
+              "duration_s": "float32", "operational_co2_g": "float32",
+              "embodied_co2_g": "float32", "total_co2_g": "float32",
+              "carbon_debt_ratio": "float32", "power_w": "float32",
+              "server_age_years": "float32"}
+    df = pd.read_csv(path, dtype=dtypes)
+    print(f"✅ Loaded {len(df)} experiment records")
+    return df
+
+
+def compute_base_aggregates(df):
+    """
+    Single fused groupby over (strategy, workload_scale).
+
+    Group keys become categoricals so the grouper hashes integer codes,
+    and both the strategy comparison and the workload-impact view project
+    their numbers from this compact frame instead of re-grouping the full
+    log. Sums (plus a sum of squares) are kept so per-strategy means and
+    stds roll up exactly from the per-cell rows.
+    """
+    for col in ("strategy", "workload_scale", "server_age"):
+        df[col] = df[col].astype("category")
+
+    base = (
+        df.assign(_co2_sq=df["total_co2_g"] ** 2)
+          .groupby(["strategy", "workload_scale"], observed=True)
+          .agg(
+              co2_sum=("total_co2_g", "sum"),
+              co2_sq_sum=("_co2_sq", "sum"),
+              operational_sum=("operational_co2_g", "sum"),
+              embodied_sum=("embodied_co2_g", "sum"),
+              age_sum=("server_age_years", "sum"),
+              debt_sum=("carbon_debt_ratio", "sum"),
+              runs=("total_co2_g", "size"),
+          )
+    )
+    return base
+
+
+def analyze_strategy_comparison(base):
+    """
+    Compare strategies on carbon metrics.
+
+    Rolls the fused (strategy, workload_scale) aggregates up to one row
+    per strategy; callers index the resulting small frame by strategy
+    name instead of re-scanning the full DataFrame with boolean masks.
+    """
+    g = base.groupby(level="strategy", observed=True).sum()
+    n = g["runs"]
+    var = ((g["co2_sq_sum"] - g["co2_sum"] ** 2 / n) / (n - 1)).clip(lower=0)
+    stats = pd.DataFrame({
+        "mean_co2": g["co2_sum"] / n,
+        "std_co2": np.sqrt(var),
+        "mean_operational": g["operational_sum"] / n,
+        "mean_embodied": g["embodied_sum"] / n,
+        "mean_age": g["age_sum"] / n,
+        "mean_debt": g["debt_sum"] / n,
+        "runs": n,
+    })
+
+    print("\n" + "=" * 70)
+    print("  STRATEGY COMPARISON")
+    print("=" * 70)
+    print(f"\n{'Strategy':<25} {'Total CO₂':>12} {'Operational':>12} {'Embodied':>12} {'Avg Age':>8}")
+    print("-" * 75)
+    for row in stats.itertuples():
+        print(f"{row.Index:<25} {row.mean_co2:>11.6f}g {row.mean_operational:>11.6f}g "
+              f"{row.mean_embodied:>11.6f}g {row.mean_age:>7.1f}y")
+
+    return stats
+
+
+def analyze_workload_impact(base):
+    """Mean total carbon per strategy across workload scales."""
+    impact = (base["co2_sum"] / base["runs"]).unstack("workload_scale")
+
+    print("\n" + "=" * 70)
+    print("  WORKLOAD SCALE IMPACT")
+    print("=" * 70)
+    print(impact.round(6).to_string())
+
+    return impact
+
+
+def analyze_server_age_distribution(df):
+    """How often each strategy selects new / medium / old servers."""
+    # Count straight on the category codes in one linear pass - no
+    # hashmap grouper or multi-index unstack for this tiny cross-tab
+    strategies = df["strategy"].cat.categories
+    ages = df["server_age"].cat.categories
+    mat = np.zeros((len(strategies), len(ages)), dtype=np.int64)
+    np.add.at(mat, (df["strategy"].cat.codes.to_numpy(),
+                    df["server_age"].cat.codes.to_numpy()), 1)
+
+    age_dist = pd.DataFrame(mat, index=strategies, columns=ages)
+    age_dist.index.name = "strategy"
+    age_dist.columns.name = "server_age"
+    age_pct = pd.DataFrame(mat / mat.sum(axis=1, keepdims=True) * 100,
+                           index=age_dist.index, columns=age_dist.columns)
+
+    print("\n" + "=" * 70)
+    print("  SERVER AGE SELECTION")
+    print("=" * 70)
+    print("\nSelection counts:")
+    print(age_dist.to_string())
+    print("\nSelection percentages:")
+    print(age_pct.round(1).to_string())
+
+    return age_dist
+
+
+def create_visualizations(df, stats, impact, age_dist, publish=False):
+    """Generate the 6-panel analysis dashboard from precomputed views."""
+    from matplotlib import cbook
+    from scipy.stats import gaussian_kde
+
+    fig = plt.figure(figsize=(18, 12))
+    gs = fig.add_gridspec(2, 3, hspace=0.35, wspace=0.3)
+
+    # One group-scan supplies both distribution panels: quantiles for the
+    # box plot and the raw per-strategy arrays for the violin KDEs
+    by_strategy = {s: g.to_numpy()
+                   for s, g in df.groupby("strategy", observed=True)["total_co2_g"]}
+    strategies = list(by_strategy)
+    quantiles = {s: np.quantile(v, [0.05, 0.25, 0.5, 0.75, 0.95])
+                 for s, v in by_strategy.items()}
+
+    # Plot 1: mean total carbon by strategy (reuses precomputed stats)
+    ax1 = fig.add_subplot(gs[0, 0])
+    ax1.bar(stats.index, stats["mean_co2"], yerr=stats["std_co2"],
+            color="#4ecdc4", alpha=0.8, capsize=4)
+    ax1.set_title("Mean Total CO₂ by Strategy", fontsize=12, fontweight="bold")
+    ax1.set_ylabel("CO₂ (g)")
+    ax1.tick_params(axis="x", rotation=30)
+
+    # Plot 2: operational vs embodied breakdown
+    ax2 = fig.add_subplot(gs[0, 1])
+    ax2.bar(stats.index, stats["mean_operational"], label="Operational", color="#ff6b6b")
+    ax2.bar(stats.index, stats["mean_embodied"], bottom=stats["mean_operational"],
+            label="Embodied", color="#4ecdc4")
+    ax2.set_title("Carbon Breakdown", fontsize=12, fontweight="bold")
+    ax2.set_ylabel("CO₂ (g)")
+    ax2.legend(fontsize=9)
+    ax2.tick_params(axis="x", rotation=30)
+
+    # Plot 3: distribution of total carbon per strategy, rendered from
+    # the precomputed quantiles (no per-call re-aggregation in seaborn)
+    ax3 = fig.add_subplot(gs[0, 2])
+    bxp_stats = [{"label": s,
+                  "whislo": quantiles[s][0], "q1": quantiles[s][1],
+                  "med": quantiles[s][2], "q3": quantiles[s][3],
+                  "whishi": quantiles[s][4], "fliers": []}
+                 for s in strategies]
+    ax3.bxp(bxp_stats, showfliers=False)
+    ax3.set_title("Total CO₂ Distribution", fontsize=12, fontweight="bold")
+    ax3.set_xlabel("")
+    ax3.tick_params(axis="x", rotation=30)
+
+    # Plot 4: carbon by workload scale
+    ax4 = fig.add_subplot(gs[1, 0])
+    impact.plot(kind="bar", ax=ax4)
+    ax4.set_title("Carbon by Workload Scale", fontsize=12, fontweight="bold")
+    ax4.set_ylabel("Mean CO₂ (g)")
+    ax4.legend(title="Scale", fontsize=8)
+    ax4.tick_params(axis="x", rotation=30)
+
+    # Plot 5: server age selection
+    ax5 = fig.add_subplot(gs[1, 1])
+    age_dist.plot(kind="bar", stacked=True, ax=ax5,
+                  color=["#74b9ff", "#fdcb6e", "#e17055"])
+    ax5.set_title("Server Age Selection", fontsize=12, fontweight="bold")
+    ax5.set_ylabel("Count")
+    ax5.legend(title="Server Age", fontsize=8)
+    ax5.tick_params(axis="x", rotation=30)
+
+    # Plot 6: carbon per run distribution (violin from precomputed KDEs)
+    ax6 = fig.add_subplot(gs[1, 2])
+    try:
+        vpstats = cbook.violin_stats(
+            [by_strategy[s] for s in strategies],
+            lambda d, coords: gaussian_kde(d).evaluate(coords))
+        ax6.violin(vpstats, positions=range(len(strategies)),
+                   showmeans=True, showmedians=True)
+    except np.linalg.LinAlgError:
+        # Degenerate (constant) samples - fall back to the box stats
+        ax6.bxp(bxp_stats, positions=range(len(strategies)), showfliers=False)
+    ax6.set_xticks(range(len(strategies)))
+    ax6.set_xticklabels(strategies)
+    ax6.set_title("Carbon per Run Distribution", fontsize=12, fontweight="bold")
+    ax6.set_xlabel("")
+    ax6.tick_params(axis="x", rotation=30)
+
+    # Rasterization cost scales quadratically with dpi; 120 is plenty for
+    # screen use, and skipping bbox_inches='tight' avoids a second render
+    output_file = os.path.join(OUTPUT_DIR, "embodied_aware_analysis.png")
+    plt.savefig(output_file, dpi=300 if publish else 120)
+    print(f"\n🖼️ Saved dashboard: {output_file}")
+    plt.close(fig)
+
+
+def generate_summary_report(df, stats):
+    """Print savings vs the operational-only baseline using precomputed stats."""
+    print("\n" + "=" * 70)
+    print("  SUMMARY REPORT")
+    print("=" * 70)
+
+    if "operational_only" not in stats.index:
+        print("⚠️ No operational_only baseline in results - skipping comparison")
+        return
+
+    baseline = stats.loc["operational_only", "mean_co2"]
+
+    for row in stats.itertuples():
+        if row.Index == "operational_only":
+            continue
+        diff_g = row.mean_co2 - baseline
+        diff_pct = (diff_g / baseline) * 100 if baseline > 0 else 0
+        verdict = "✅ saves" if diff_g < 0 else "❌ costs"
+        print(f"\n{row.Index} vs operational_only:")
+        print(f"  {verdict} {abs(diff_g):.6f}g per run ({diff_pct:+.2f}%)")
+        print(f"  Avg server age: {row.mean_age:.1f}y | Avg carbon debt: {row.mean_debt:.1%}")
+
+    summary_file = os.path.join(OUTPUT_DIR, "strategy_summary.csv")
+    stats.to_csv(summary_file)
+    print(f"\n📁 Saved summary CSV: {summary_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze embodied-aware experiment results")
+    parser.add_argument("--publish", action="store_true",
+                        help="render the dashboard at publication quality (dpi=300)")
+    args = parser.parse_args()
+
+    df = load_results()
+
+    base = compute_base_aggregates(df)
+    stats = analyze_strategy_comparison(base)
+    impact = analyze_workload_impact(base)
+    age_dist = analyze_server_age_distribution(df)
+    create_visualizations(df, stats, impact, age_dist, publish=args.publish)
+    generate_summary_report(df, stats)
+
+    print("\n✅ Analysis complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+analyze_embodied_carbon.py
+==========================
+Standalone analysis of embodied carbon across instance types plus a
+statistical summary of the enhanced experiment log (Data/results_enhanced.csv)
+produced by serverless_task_enhanced.py.
+"""
+
+import functools
+import os
+import sys
+import pandas as pd
+
+from embodied_carbon import EmbodiedCarbonTracker, INSTANCE_SPECS
+
+ENHANCED_FILE = os.path.join("Data", "results_enhanced.csv")
+
+# Typical workload durations to amortize over (hours)
+DURATIONS_H = [0.001, 0.01, 0.1, 1.0, 24.0]
+
+
+@functools.lru_cache(maxsize=None)
+def instance_carbon(instance_type, duration_hours):
+    """(total_kg, amortized_g) for an instance type at a given duration.
+
+    The tracker's spec walk and float math are pure in these two
+    arguments, so results are memoized - repeated comparisons hit the
+    cache instead of rebuilding a tracker per call.
+    """
+    tracker = EmbodiedCarbonTracker(instance_type=instance_type)
+    total_kg = tracker.calculate_total_embodied_carbon()
+    amortized_g = tracker.calculate_amortized_embodied_carbon(duration_hours)
+    return total_kg, amortized_g
+
+
+def compare_instance_types():
+    """Compare embodied carbon across all known instance types."""
+    print("=" * 70)
+    print("  EMBODIED CARBON BY INSTANCE TYPE")
+    print("=" * 70)
+
+    header = f"\n{'Instance':<15} {'Total (kg)':>11}" + "".join(
+        f" {d:>9}h" for d in DURATIONS_H)
+    print(header)
+    print("-" * len(header))
+
+    for instance_type in INSTANCE_SPECS:
+        total_kg, _ = instance_carbon(instance_type, DURATIONS_H[0])
+        amortized = [instance_carbon(instance_type, d)[1] for d in DURATIONS_H]
+        print(f"{instance_type:<15} {total_kg:>11.1f}" + "".join(
+            f" {a:>9.4f}" for a in amortized))
+
+    print("\n(amortized columns in g CO₂e per workload at each duration)")
+
+
+def analyze_enhanced_results(path=ENHANCED_FILE):
+    """Summarize the enhanced experiment log (carbon + telemetry)."""
+    if not os.path.exists(path):
+        print(f"\n⚠️ No enhanced results at {path} - run serverless_task_enhanced.py first")
+        return
+
+    df = pd.read_csv(path)
+    print("\n" + "=" * 70)
+    print("  ENHANCED RESULTS SUMMARY")
+    print("=" * 70)
+    print(f"\n✅ Loaded {len(df)} enhanced records")
+
+    carbon_cols = ["operational_co2_g", "embodied_co2_g", "total_co2_g"]
+    telemetry_cols = ["cpu_percent_avg", "memory_percent_avg", "duration_s"]
+
+    # One agg pass per column covers every reduction below - no separate
+    # mean/median/std/max walks over the same data
+    stats = df[carbon_cols + telemetry_cols].agg(
+        ["mean", "median", "std", "max", "sum"])
+
+    print("\nCarbon (g CO₂e per run):")
+    for col in carbon_cols:
+        print(f"  {col:<20} mean={stats.loc['mean', col]:.6f}  "
+              f"median={stats.loc['median', col]:.6f}  "
+              f"std={stats.loc['std', col]:.6f}  "
+              f"max={stats.loc['max', col]:.6f}")
+
+    print("\nTelemetry:")
+    for col in telemetry_cols:
+        print(f"  {col:<20} mean={stats.loc['mean', col]:.3f}  "
+              f"median={stats.loc['median', col]:.3f}  "
+              f"std={stats.loc['std', col]:.3f}  "
+              f"max={stats.loc['max', col]:.3f}")
+
+    total_op = stats.loc["sum", "operational_co2_g"]
+    total_emb = stats.loc["sum", "embodied_co2_g"]
+    grand = total_op + total_emb
+    if grand > 0:
+        print(f"\nTotal operational: {total_op:.6f}g ({total_op / grand:.1%})")
+        print(f"Total embodied:    {total_emb:.6f}g ({total_emb / grand:.1%})")
+
+    print("\nBy instance type:")
+    by_instance = df.groupby("instance_type")["total_co2_g"].mean()
+    print(by_instance.round(6).to_string())
+
+
+def main():
+    compare_instance_types()
+    analyze_enhanced_results()
+    print("\n✅ Analysis complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,15 +14,23 @@ Date: 2024-11-09
 """
 
 import sys
+import os
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 from typing import Dict, List, Tuple
 from datetime import datetime
 
+# Optional progress bar - throttles itself to a few updates per second
+# instead of a stdout flush per iteration
+try:
+    from tqdm.auto import tqdm
+except ImportError:
+    def tqdm(iterable, **kwargs):
+        return iterable
+
 # Import scheduler with temporary overrides
 from scheduler_embodied_aware import (
     choose_region_embodied_aware,
@@ -33,11 +41,111 @@ from scheduler_embodied_aware import (
     SERVER_SPECS,
     EFFICIENCY_DEGRADATION_RATE
 )
-import estimator
 
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (16, 10)
+# NOTE: matplotlib/seaborn are imported lazily inside
+# _plot_boundary_heatmap - the clean-grid and reduced-aging scenarios
+# produce CSVs only and shouldn't pay several hundred ms of plotting
+# imports at startup
+
+
+# Optional Arrow CSV writer - pandas' Python-level writer is far from
+# I/O-bound on large clean-grid dumps
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+
+def _write_csv(df: pd.DataFrame, path: Path):
+    """Write a result CSV via the multithreaded Arrow writer when available."""
+    if ARROW_AVAILABLE:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    else:
+        df.to_csv(path, index=False, chunksize=65536)
+
+
+def _run_clean_grid_cell(args):
+    """
+    Evaluate one (ci, duration_s, strategy) clean-grid cell.
+
+    Module-level so ProcessPoolExecutor workers can pickle it. With the
+    CI pinned the scheduler has no stochastic inputs, so two trial calls
+    are made; if they agree on the decision fields, one record stands in
+    for the whole batch instead of paying num_tasks identical scheduler
+    invocations.
+
+    Returns (cell_summary, detail_records, n_errors). detail_records is
+    filled only when save_full_details is set - the summary and boundary
+    detection work from the per-cell aggregates alone, so the default
+    IPC payload and memory footprint is one small dict per cell.
+    """
+    ci, duration_s, strategy, num_tasks, save_full_details = args
+    sla_ms = max(2000, duration_s * 100)
+
+    def make_record(result, i):
+        return {
+            "ci": ci,
+            "duration_s": duration_s,
+            "duration_hr": duration_s / 3600,
+            "strategy": strategy,
+            "task_id": i,
+            "total_g": result["total_co2_g"],
+            "operational_g": result["operational_co2_g"],
+            "embodied_g": result["embodied_co2_g"],
+            "power_w": result["power_consumption_w"],
+            "server_age": result["server_age_years"],
+        }
+
+    try:
+        trial = choose_region_embodied_aware(
+            duration_s=duration_s, sla_ms=sla_ms,
+            strategy=strategy, verbose=False, ci_override=ci)
+        retrial = choose_region_embodied_aware(
+            duration_s=duration_s, sla_ms=sla_ms,
+            strategy=strategy, verbose=False, ci_override=ci)
+    except Exception:
+        return None, [], num_tasks
+
+    # Compare decision fields only (the result embeds itself in
+    # top_3_alternatives, so dict == recurses)
+    check = ("region", "server_age", "total_co2_g",
+             "operational_co2_g", "embodied_co2_g", "score")
+    if all(trial.get(k) == retrial.get(k) for k in check):
+        base = make_record(trial, 0)
+        summary = dict(base, task_id=-1, n_tasks=num_tasks, std_total=0.0)
+        details = ([dict(base, task_id=i) for i in range(num_tasks)]
+                   if save_full_details else [])
+        return summary, details, 0
+
+    # Scheduler turned out non-deterministic - fall back to one real
+    # call per task
+    records = []
+    n_errors = 0
+    for i in range(num_tasks):
+        try:
+            result = choose_region_embodied_aware(
+                duration_s=duration_s, sla_ms=sla_ms,
+                strategy=strategy, verbose=False, ci_override=ci)
+            records.append(make_record(result, i))
+        except Exception:
+            n_errors += 1
+    if not records:
+        return None, [], n_errors
+
+    n = len(records)
+    summary = {"ci": ci, "duration_s": duration_s,
+               "duration_hr": duration_s / 3600, "strategy": strategy,
+               "task_id": -1, "n_tasks": n}
+    totals = np.fromiter((r["total_g"] for r in records),
+                         dtype=np.float32, count=n)
+    summary["total_g"] = float(totals.mean())
+    summary["std_total"] = float(totals.std())
+    for field in ("operational_g", "embodied_g", "power_w", "server_age"):
+        summary[field] = float(np.fromiter(
+            (r[field] for r in records), dtype=np.float32, count=n).mean())
+    return summary, records if save_full_details else [], n_errors
 
 
 class BoundaryTester:
@@ -48,9 +156,10 @@ class BoundaryTester:
         self.output_dir.mkdir(exist_ok=True)
         self.results = []
         
-    def test_clean_grid(self, carbon_intensities: List[int], 
+    def test_clean_grid(self, carbon_intensities: List[int],
                        num_tasks: int = 500,
-                       durations: List[int] = None) -> pd.DataFrame:
+                       durations: List[int] = None,
+                       save_full_details: bool = False) -> pd.DataFrame:
         """
         Test if embodied-aware wins in clean grids (low carbon intensity).
         
@@ -61,7 +170,9 @@ class BoundaryTester:
             carbon_intensities: List of CI values to test (e.g., [50, 100, 200, 535])
             num_tasks: Number of tasks per CI value
             durations: Task durations in seconds (default: [3600, 14400])
-            
+            save_full_details: Keep one row per task in the result CSV
+                (default is one aggregate row per cell - ~num_tasks× smaller)
+
         Returns:
             DataFrame with results showing where embodied-aware wins
         """
@@ -76,89 +187,104 @@ class BoundaryTester:
         print(f"Tasks per CI: {num_tasks}")
         print(f"Durations: {durations}s")
         
-        # Store original CI function
-        original_get_ci = estimator.get_live_ci
-        
-        results = []
-        
+        # Preallocate one typed row per expected task - no per-row dict
+        # hash tables in the hot loop and no dtype inference when the
+        # frame is built at the end (only needed in full-details mode)
+        row_dtype = np.dtype([
+            ("ci", "i4"), ("duration_s", "i4"), ("duration_hr", "f4"),
+            ("strategy", "U24"), ("task_id", "i4"), ("total_g", "f4"),
+            ("operational_g", "f4"), ("embodied_g", "f4"),
+            ("power_w", "f4"), ("server_age", "f4"),
+        ])
+        arr = None
+        if save_full_details:
+            arr = np.empty(
+                len(carbon_intensities) * len(durations) * 2 * num_tasks,
+                dtype=row_dtype)
+        n_rows = 0
+        cell_summaries = []
+        cell_means = {}  # (ci, duration_s, strategy) -> mean total_g
+
+        strategies = ["operational_only", "embodied_prioritized"]
+        cells = [(ci, duration_s, strategy)
+                 for ci in carbon_intensities
+                 for duration_s in durations
+                 for strategy in strategies]
+
+        # With CI passed explicitly (no module patching, which also
+        # silently missed the scheduler's from-import of get_live_ci),
+        # the cells are fully independent - fan them out across cores.
+        # map() preserves order for the grouped printing below.
+        with ProcessPoolExecutor(
+                max_workers=min(len(cells), os.cpu_count() or 1)) as ex:
+            cell_outputs = dict(zip(cells, tqdm(
+                ex.map(_run_clean_grid_cell,
+                       [cell + (num_tasks, save_full_details)
+                        for cell in cells]),
+                total=len(cells), desc="clean-grid cells", leave=False)))
+
         for ci in carbon_intensities:
             print(f"\n{'='*80}")
             print(f"Testing CI = {ci} gCO₂/kWh")
             print(f"{'='*80}")
-            
-            # Override CI function to return fixed value
-            def mock_ci(region):
-                return ci
-            
-            estimator.get_live_ci = mock_ci
-            
+
             for duration_s in durations:
                 print(f"\n  Duration: {duration_s}s ({duration_s/3600:.1f}hr)")
-                
-                # Test both strategies
-                for strategy in ["operational_only", "embodied_prioritized"]:
-                    strategy_results = []
-                    
-                    for i in range(num_tasks):
-                        try:
-                            result = choose_region_embodied_aware(
-                                duration_s=duration_s,
-                                sla_ms=max(2000, duration_s * 100),
-                                strategy=strategy,
-                                verbose=False
-                            )
-                            
-                            strategy_results.append({
-                                "ci": ci,
-                                "duration_s": duration_s,
-                                "duration_hr": duration_s / 3600,
-                                "strategy": strategy,
-                                "task_id": i,
-                                "total_g": result["total_co2_g"],
-                                "operational_g": result["operational_co2_g"],
-                                "embodied_g": result["embodied_co2_g"],
-                                "power_w": result["power_consumption_w"],
-                                "server_age": result["server_age_years"],
-                            })
-                            
-                        except Exception as e:
-                            print(f"    ❌ Error task {i}: {e}")
-                            continue
-                    
-                    # Calculate statistics
-                    if strategy_results:
-                        avg_total = np.mean([r["total_g"] for r in strategy_results])
-                        std_total = np.std([r["total_g"] for r in strategy_results])
-                        
-                        print(f"    {strategy:25s}: {avg_total:.3f}g ± {std_total:.3f}g")
-                        
-                        results.extend(strategy_results)
-                
-                # Calculate and display penalty
-                df_temp = pd.DataFrame(results)
-                if len(df_temp) > 0:
-                    df_ci_dur = df_temp[(df_temp["ci"] == ci) & (df_temp["duration_s"] == duration_s)]
-                    
-                    if len(df_ci_dur) > 0:
-                        op_only = df_ci_dur[df_ci_dur["strategy"] == "operational_only"]["total_g"].mean()
-                        emb_prio = df_ci_dur[df_ci_dur["strategy"] == "embodied_prioritized"]["total_g"].mean()
-                        
-                        if op_only > 0:
-                            penalty_pct = ((emb_prio - op_only) / op_only) * 100
-                            
-                            if penalty_pct < 0:
-                                print(f"    ✅ Embodied-aware WINS by {-penalty_pct:.1f}%!")
-                            else:
-                                print(f"    ❌ Embodied-aware loses by {penalty_pct:.1f}%")
-        
-        # Restore original function
-        estimator.get_live_ci = original_get_ci
-        
-        df = pd.DataFrame(results)
+
+                for strategy in strategies:
+                    summary, detail_records, n_errors = \
+                        cell_outputs[(ci, duration_s, strategy)]
+                    if n_errors:
+                        print(f"    ❌ {n_errors} task(s) failed for {strategy}")
+                    if summary is None:
+                        continue
+
+                    cell_summaries.append(summary)
+                    avg_total = summary["total_g"]
+                    print(f"    {strategy:25s}: {avg_total:.3f}g "
+                          f"± {summary['std_total']:.3f}g")
+                    cell_means[(ci, duration_s, strategy)] = avg_total
+
+                    if save_full_details and detail_records:
+                        # Fill the preallocated slice: cell-constant fields
+                        # broadcast as scalars, per-task fields streamed in
+                        # via fromiter without an intermediate list
+                        n = len(detail_records)
+                        cell = arr[n_rows:n_rows + n]
+                        cell["ci"] = ci
+                        cell["duration_s"] = duration_s
+                        cell["duration_hr"] = duration_s / 3600
+                        cell["strategy"] = strategy
+                        for field in ("task_id", "total_g", "operational_g",
+                                      "embodied_g", "power_w", "server_age"):
+                            cell[field] = np.fromiter(
+                                (r[field] for r in detail_records),
+                                dtype=cell.dtype[field], count=n)
+                        n_rows += n
+
+                # Calculate and display penalty from the per-cell means -
+                # no DataFrame rebuild/filter over all rows accumulated so far
+                op_only = cell_means.get((ci, duration_s, "operational_only"))
+                emb_prio = cell_means.get((ci, duration_s, "embodied_prioritized"))
+                if op_only and emb_prio is not None:
+                    penalty_pct = ((emb_prio - op_only) / op_only) * 100
+
+                    if penalty_pct < 0:
+                        print(f"    ✅ Embodied-aware WINS by {-penalty_pct:.1f}%!")
+                    else:
+                        print(f"    ❌ Embodied-aware loses by {penalty_pct:.1f}%")
+        
+        if save_full_details:
+            # Single conversion from the typed rows actually filled
+            df = pd.DataFrame.from_records(arr[:n_rows])
+        else:
+            # One aggregate row per cell - everything downstream works
+            # from the means
+            df = pd.DataFrame(cell_summaries).drop(columns=["task_id"])
         
         # Save results
         output_file = self.output_dir / "clean_grid_results.csv"
-        df.to_csv(output_file, index=False)
+        _write_csv(df, output_file)
         print(f"\n✅ Results saved: {output_file}")
         
         # Generate summary
@@ -263,7 +389,7 @@ class BoundaryTester:
         
         # Save results
         output_file = self.output_dir / "reduced_aging_results.csv"
-        df.to_csv(output_file, index=False)
+        _write_csv(df, output_file)
         print(f"\n✅ Results saved: {output_file}")
         
         # Find threshold
@@ -271,10 +397,11 @@ class BoundaryTester:
         
         return df
     
-    def test_combined_boundaries(self, 
+    def test_combined_boundaries(self,
                                 ci_range: List[int],
                                 aging_range: List[float],
-                                duration_s: int = 14400) -> pd.DataFrame:
+                                duration_s: int = 14400,
+                                dpi: int = 300) -> pd.DataFrame:
         """
         Test combined effect of CI and aging to create boundary heatmap.
         
@@ -292,48 +419,52 @@ class BoundaryTester:
         print(f"\nTesting {len(ci_range)} CI values × {len(aging_range)} aging rates")
         print(f"Total: {len(ci_range) * len(aging_range)} combinations")
         
-        results = []
-        
-        for ci in ci_range:
-            for rate in aging_range:
-                # Calculate with this CI and aging rate
-                new_power = calculate_power_consumption(BASE_POWER_W, 0.5, alpha=rate)
-                old_power = calculate_power_consumption(BASE_POWER_W, 4.0, alpha=rate)
-                
-                # Operational carbon
-                energy_new = (new_power * duration_s / 3600) / 1000
-                energy_old = (old_power * duration_s / 3600) / 1000
-                op_new = energy_new * ci * 1.2
-                op_old = energy_old * ci * 1.2
-                
-                # Embodied carbon (unchanged by CI or aging)
-                _, emb_new, _ = calculate_total_carbon("new", duration_s, 535)
-                _, emb_old, _ = calculate_total_carbon("old", duration_s, 535)
-                
-                total_new = op_new + emb_new
-                total_old = op_old + emb_old
-                
-                penalty_pct = ((total_old - total_new) / total_new) * 100
-                
-                results.append({
-                    "ci": ci,
-                    "degradation_rate": rate,
-                    "degradation_pct": rate * 100,
-                    "penalty_pct": penalty_pct,
-                    "embodied_wins": penalty_pct < 0,
-                    "total_new_g": total_new,
-                    "total_old_g": total_old,
-                })
-        
-        df = pd.DataFrame(results)
+        # Whole grid at once: broadcast CI against aging rate and let the
+        # element-wise math run in vectorized C loops instead of scalar
+        # Python arithmetic per cell (ci-major order matches the old loop)
+        # FP32 is plenty for values displayed at 1-2 decimals; it halves
+        # the bandwidth the element-wise ops move and doubles SIMD width
+        CI, RATE = np.meshgrid(np.asarray(ci_range, dtype=np.float32),
+                               np.asarray(aging_range, dtype=np.float32),
+                               indexing="ij")
+
+        # Power with degradation capped at +60% (same formula as
+        # calculate_power_consumption)
+        new_power = BASE_POWER_W * (1 + np.minimum(RATE * 0.5, 0.60))
+        old_power = BASE_POWER_W * (1 + np.minimum(RATE * 4.0, 0.60))
+
+        # Operational carbon
+        energy_new = (new_power * duration_s / 3600) / 1000
+        energy_old = (old_power * duration_s / 3600) / 1000
+        op_new = energy_new * CI * 1.2
+        op_old = energy_old * CI * 1.2
+
+        # Embodied carbon (unchanged by CI or aging) - hoisted out of the grid
+        _, emb_new, _ = calculate_total_carbon("new", duration_s, 535)
+        _, emb_old, _ = calculate_total_carbon("old", duration_s, 535)
+
+        total_new = op_new + emb_new
+        total_old = op_old + emb_old
+
+        penalty_pct = ((total_old - total_new) / total_new) * 100
+
+        df = pd.DataFrame({
+            "ci": CI.ravel().astype(np.int32),  # CI values stay integral
+            "degradation_rate": RATE.ravel(),
+            "degradation_pct": RATE.ravel() * 100,
+            "penalty_pct": penalty_pct.ravel(),
+            "embodied_wins": (penalty_pct < 0).ravel(),
+            "total_new_g": total_new.ravel(),
+            "total_old_g": total_old.ravel(),
+        })
         
         # Save results
         output_file = self.output_dir / "combined_boundary_results.csv"
-        df.to_csv(output_file, index=False)
+        _write_csv(df, output_file)
         print(f"\n✅ Results saved: {output_file}")
         
         # Generate heatmap
-        self._plot_boundary_heatmap(df, ci_range, aging_range)
+        self._plot_boundary_heatmap(df, ci_range, aging_range, dpi=dpi)
         
         return df
     
@@ -343,38 +474,30 @@ class BoundaryTester:
         print("  CLEAN GRID TEST SUMMARY")
         print("="*80)
         
-        summary = []
-        
-        for ci in ci_values:
-            df_ci = df[df["ci"] == ci]
-            
-            for duration_s in df_ci["duration_s"].unique():
-                df_ci_dur = df_ci[df_ci["duration_s"] == duration_s]
-                
-                op_only = df_ci_dur[df_ci_dur["strategy"] == "operational_only"]["total_g"].mean()
-                emb_prio = df_ci_dur[df_ci_dur["strategy"] == "embodied_prioritized"]["total_g"].mean()
-                
-                penalty_pct = ((emb_prio - op_only) / op_only) * 100
-                
-                summary.append({
-                    "ci": ci,
-                    "duration_hr": duration_s / 3600,
-                    "operational_only_g": op_only,
-                    "embodied_prioritized_g": emb_prio,
-                    "penalty_pct": penalty_pct,
-                    "embodied_wins": penalty_pct < 0,
-                })
-        
-        summary_df = pd.DataFrame(summary)
-        
+        # One O(N) groupby pass instead of two boolean-mask filters per
+        # (ci, duration) cell
+        means = (df.groupby(["ci", "duration_s", "strategy"], sort=False)
+                   ["total_g"].mean().unstack("strategy"))
+
+        summary_df = pd.DataFrame({
+            "ci": means.index.get_level_values("ci"),
+            "duration_hr": means.index.get_level_values("duration_s") / 3600,
+            "operational_only_g": means["operational_only"].to_numpy(),
+            "embodied_prioritized_g": means["embodied_prioritized"].to_numpy(),
+        })
+        summary_df["penalty_pct"] = ((summary_df["embodied_prioritized_g"] -
+                                      summary_df["operational_only_g"]) /
+                                     summary_df["operational_only_g"]) * 100
+        summary_df["embodied_wins"] = summary_df["penalty_pct"] < 0
+
         # Display table
         print(f"\n{'CI':>6s} {'Duration':>10s} {'Op-Only':>12s} {'Emb-Prio':>12s} {'Penalty':>10s} {'Winner':>15s}")
         print("-" * 70)
-        
-        for _, row in summary_df.iterrows():
-            winner = "Embodied ✅" if row["embodied_wins"] else "Operational ✅"
-            print(f"{row['ci']:>6.0f} {row['duration_hr']:>10.1f}hr {row['operational_only_g']:>12.2f}g "
-                  f"{row['embodied_prioritized_g']:>12.2f}g {row['penalty_pct']:>9.1f}% {winner:>15s}")
+
+        for row in summary_df.itertuples():
+            winner = "Embodied ✅" if row.embodied_wins else "Operational ✅"
+            print(f"{row.ci:>6.0f} {row.duration_hr:>10.1f}hr {row.operational_only_g:>12.2f}g "
+                  f"{row.embodied_prioritized_g:>12.2f}g {row.penalty_pct:>9.1f}% {winner:>15s}")
         
         # Find threshold
         winning_scenarios = summary_df[summary_df["embodied_wins"]]
@@ -387,7 +510,7 @@ class BoundaryTester:
             print(f"   Need to test lower CI values (e.g., <{min(ci_values)})")
         
         # Save summary
-        summary_df.to_csv(self.output_dir / "clean_grid_summary.csv", index=False)
+        _write_csv(summary_df, self.output_dir / "clean_grid_summary.csv")
     
     def _summarize_reduced_aging(self, df: pd.DataFrame):
         """Generate summary for reduced aging tests."""
@@ -415,10 +538,23 @@ class BoundaryTester:
             print(f"\n⚠️  Embodied-aware never wins even at {min_tested:.0f}%/year aging")
             print(f"   Current model: operational penalty always exceeds embodied savings")
     
-    def _plot_boundary_heatmap(self, df: pd.DataFrame, ci_range: List[int], aging_range: List[float]):
+    def _plot_boundary_heatmap(self, df: pd.DataFrame, ci_range: List[int],
+                               aging_range: List[float], dpi: int = 300):
         """Create heatmap showing where embodied-aware wins."""
-        # Pivot for heatmap
-        heatmap_data = df.pivot(index="degradation_pct", columns="ci", values="penalty_pct")
+        # Plotting stack loaded only here - CSV-only scenarios skip it
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        sns.set_style("whitegrid")
+
+        # Rows were generated in ci-major grid order, so a plain reshape
+        # recovers the matrix - no hash-indexed pivot/sort needed
+        heatmap_data = pd.DataFrame(
+            df["penalty_pct"].to_numpy()
+              .reshape(len(ci_range), len(aging_range)).T,
+            index=[rate * 100 for rate in aging_range],
+            columns=ci_range)
+        heatmap_data.index.name = "degradation_pct"
+        heatmap_data.columns.name = "ci"
         
         fig, ax = plt.subplots(figsize=(12, 8))
         
@@ -440,7 +576,7 @@ class BoundaryTester:
         plt.tight_layout()
         
         output_file = self.output_dir / "boundary_heatmap.png"
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
         print(f"\n✅ Heatmap saved: {output_file}")
 
 
@@ -458,6 +594,11 @@ def main():
                        help="Task duration in seconds (default: 4hr)")
     parser.add_argument("--output", type=str, default="boundary_tests",
                        help="Output directory")
+    parser.add_argument("--dpi", type=int, default=300,
+                       help="Heatmap resolution (use 150 for faster CI runs)")
+    parser.add_argument("--save-full-details", action="store_true",
+                       help="keep one clean-grid CSV row per task instead of "
+                            "one aggregate row per cell")
     
     args = parser.parse_args()
     
@@ -471,7 +612,8 @@ def main():
         print("\n" + "🔬" * 40)
         print("STARTING CLEAN GRID BOUNDARY TEST")
         print("🔬" * 40)
-        tester.test_clean_grid(ci_values, num_tasks=args.tasks, durations=[3600, args.duration])
+        tester.test_clean_grid(ci_values, num_tasks=args.tasks, durations=[3600, args.duration],
+                               save_full_details=args.save_full_details)
     
     if args.scenario in ["reduced_aging", "all"]:
         print("\n" + "🔬" * 40)
@@ -483,7 +625,8 @@ def main():
         print("\n" + "🔬" * 40)
         print("STARTING COMBINED BOUNDARY ANALYSIS")
         print("🔬" * 40)
-        tester.test_combined_boundaries(ci_values, aging_rates, duration_s=args.duration)
+        tester.test_combined_boundaries(ci_values, aging_rates, duration_s=args.duration,
+                                        dpi=args.dpi)
     
     print("\n" + "="*80)
     print("  ✅ ALL BOUNDARY TESTS COMPLETE")
@@ -8,7 +8,10 @@ Embodied carbon represents the total GHG emissions from manufacturing,
 transporting, and disposing of hardware over its lifetime.
 """
 
+import atexit
+import functools
 import psutil
+import threading
 import time
 import json
 from datetime import datetime
@@ -45,6 +48,9 @@ EMBODIED_CARBON = {
     "server_2u": 800.0,       # 2U server (total)
 }
 
+# Bytes→GB as a multiply (divides are slower and this runs per sample)
+_GB = 1.0 / (1 << 30)
+
 # Expected hardware lifetime (years)
 HARDWARE_LIFETIME = {
     "cpu": 5.0,
@@ -109,83 +115,139 @@ INSTANCE_SPECS = {
 }
 
 
+def _compute_total_for_spec(specs: Dict) -> float:
+    """Sum embodied carbon over the hardware components in a spec dict."""
+    total = EMBODIED_CARBON[specs["cpu_type"]] * specs["cpu_count"]
+    if specs["gpu_count"] > 0 and specs["gpu_type"]:
+        total += EMBODIED_CARBON[specs["gpu_type"]] * specs["gpu_count"]
+    total += EMBODIED_CARBON[specs["ram_type"]] * specs["ram_gb"]
+    total += EMBODIED_CARBON[specs["storage_type"]] * specs["storage_gb"]
+    return round(total, 3)
+
+
+# The specs are static, so the totals are runtime constants - hoist them
+# to import time and trackers just look theirs up
+PRECOMPUTED_EMBODIED_KG = {
+    name: _compute_total_for_spec(spec) for name, spec in INSTANCE_SPECS.items()
+}
+
+
 class EmbodiedCarbonTracker:
     """
     Track and calculate embodied carbon emissions for hardware usage.
     """
-    
-    def __init__(self, instance_type: str = "local_machine", 
-                 region: str = "Northern"):
+
+    # No per-instance __dict__: the experiment driver creates thousands of
+    # trackers and the hot paths are mostly attribute reads
+    __slots__ = (
+        "instance_type", "region", "keep_history", "specs",
+        "start_time", "_mono_start", "telemetry_data", "_stats",
+        "_cpu_logical", "_cpu_physical",
+        "_nvml", "_nvml_handle", "_gpu_count",
+        "_total_embodied_kg", "_carbon_per_hour_g",
+        "_stop_evt", "_sampler",
+    )
+
+    def __init__(self, instance_type: str = "local_machine",
+                 region: str = "Northern", keep_history: bool = False):
         """
         Initialize embodied carbon tracker.
-        
+
         Args:
             instance_type: Type of compute instance (cloud_small, cloud_medium, etc.)
             region: Data center region
+            keep_history: Retain every telemetry sample (memory grows with
+                runtime); aggregates are always available either way
         """
         self.instance_type = instance_type
         self.region = region
+        self.keep_history = keep_history
         self.specs = INSTANCE_SPECS.get(instance_type, INSTANCE_SPECS["local_machine"])
         self.start_time = None
+        self._mono_start = None
         self.telemetry_data = []
-        
+        self._stop_evt = None
+        self._sampler = None
+        self._reset_stats()
+
+        # Core counts are fixed for the life of the process - read /proc
+        # once here instead of twice per telemetry sample
+        self._cpu_logical = psutil.cpu_count(logical=True)
+        self._cpu_physical = psutil.cpu_count(logical=False)
+
+        # NVML init costs tens of ms - do it once per tracker so each GPU
+        # sample is just two getter calls (init/shutdown are ref-counted,
+        # and atexit balances our init)
+        self._nvml = None
+        self._nvml_handle = None
+        self._gpu_count = 0
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+            self._nvml = pynvml
+            self._gpu_count = pynvml.nvmlDeviceGetCount()
+            if self._gpu_count > 0:
+                self._nvml_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+            atexit.register(pynvml.nvmlShutdown)
+        except (ImportError, Exception):
+            # GPU monitoring not available
+            pass
+
+        # Specs never change after construction, so the embodied total comes
+        # from the import-time table and the per-hour amortization rate is
+        # computed once here; the public calculate_* methods are O(1) reads
+        self._total_embodied_kg = PRECOMPUTED_EMBODIED_KG.get(
+            instance_type, PRECOMPUTED_EMBODIED_KG["local_machine"])
+        avg_lifetime_years = 5.0  # Conservative estimate
+        lifetime_hours = avg_lifetime_years * 365.25 * 24
+        self._carbon_per_hour_g = (self._total_embodied_kg * 1000) / lifetime_hours
+
+    def _reset_stats(self):
+        """Running (count, sum, min, max) per metric - one pass per sample
+        instead of rescanning the full history at stop."""
+        self._stats = {
+            "cpu": [0, 0.0, float("inf"), float("-inf")],
+            "mem": [0, 0.0, float("inf"), float("-inf")],
+            "mem_gb": [0, 0.0, float("inf"), float("-inf")],
+        }
+
+    def _record(self, telemetry: Dict):
+        """Fold one telemetry sample into the running aggregates."""
+        for key, value in (("cpu", telemetry["cpu_percent"]),
+                           ("mem", telemetry["memory_percent"]),
+                           ("mem_gb", telemetry["memory_used_gb"])):
+            s = self._stats[key]
+            s[0] += 1
+            s[1] += value
+            if value < s[2]:
+                s[2] = value
+            if value > s[3]:
+                s[3] = value
+        if self.keep_history:
+            self.telemetry_data.append(telemetry)
+
     def calculate_total_embodied_carbon(self) -> float:
         """
         Calculate total embodied carbon for the hardware configuration.
-        
+
         Returns:
             Total embodied carbon in kg CO2e
         """
-        total = 0.0
-        
-        # CPU embodied carbon
-        cpu_carbon = (EMBODIED_CARBON[self.specs["cpu_type"]] * 
-                      self.specs["cpu_count"])
-        total += cpu_carbon
-        
-        # GPU embodied carbon
-        if self.specs["gpu_count"] > 0 and self.specs["gpu_type"]:
-            gpu_carbon = (EMBODIED_CARBON[self.specs["gpu_type"]] * 
-                         self.specs["gpu_count"])
-            total += gpu_carbon
-        
-        # RAM embodied carbon
-        ram_carbon = (EMBODIED_CARBON[self.specs["ram_type"]] * 
-                     self.specs["ram_gb"])
-        total += ram_carbon
-        
-        # Storage embodied carbon
-        storage_carbon = (EMBODIED_CARBON[self.specs["storage_type"]] * 
-                         self.specs["storage_gb"])
-        total += storage_carbon
-        
-        return round(total, 3)
-    
+        return self._total_embodied_kg
+
     def calculate_amortized_embodied_carbon(self, duration_hours: float) -> float:
         """
         Calculate amortized embodied carbon for a specific workload duration.
-        
+
         Formula: (Total Embodied Carbon / Expected Lifetime Hours) × Duration
-        
+
         Args:
             duration_hours: Workload duration in hours
-            
+
         Returns:
             Amortized embodied carbon in g CO2e
         """
-        total_embodied = self.calculate_total_embodied_carbon()
-        
-        # Average lifetime across all components (weighted by carbon footprint)
-        avg_lifetime_years = 5.0  # Conservative estimate
-        lifetime_hours = avg_lifetime_years * 365.25 * 24
-        
-        # Amortized carbon per hour
-        carbon_per_hour = (total_embodied * 1000) / lifetime_hours  # Convert to grams
-        
-        # Carbon for this workload
-        workload_carbon = carbon_per_hour * duration_hours
-        
-        return round(workload_carbon, 6)
+        return round(self._carbon_per_hour_g * duration_hours, 6)
     
     def collect_telemetry(self) -> Dict:
         """
@@ -194,71 +256,92 @@ class EmbodiedCarbonTracker:
         Returns:
             Dictionary with telemetry metrics
         """
+        # One snapshot per subsystem - every extra psutil call is another
+        # /proc (or statvfs) round trip
+        vm = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        freq = psutil.cpu_freq()
+
         telemetry = {
-            "timestamp": datetime.now().isoformat(),
-            
-            # CPU metrics
-            "cpu_percent": psutil.cpu_percent(interval=0.1),
-            "cpu_count_logical": psutil.cpu_count(logical=True),
-            "cpu_count_physical": psutil.cpu_count(logical=False),
-            "cpu_freq_current": psutil.cpu_freq().current if psutil.cpu_freq() else None,
-            
-            # Memory metrics
-            "memory_total_gb": round(psutil.virtual_memory().total / (1024**3), 2),
-            "memory_used_gb": round(psutil.virtual_memory().used / (1024**3), 2),
-            "memory_percent": psutil.virtual_memory().percent,
-            "memory_available_gb": round(psutil.virtual_memory().available / (1024**3), 2),
-            
+            # Raw monotonic clock - ISO formatting is deferred to
+            # stop_tracking so the hot path skips datetime entirely
+            "t": time.monotonic(),
+
+            # CPU metrics (per-process constants live on the final result).
+            # Non-blocking: reports usage since the previous call, primed in
+            # start_tracking, instead of sleeping 100ms per sample
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "cpu_freq_current": freq.current if freq else None,
+
+            # Memory metrics (raw floats; rounding happens once at result
+            # time, not per sample)
+            "memory_total_gb": vm.total * _GB,
+            "memory_used_gb": vm.used * _GB,
+            "memory_percent": vm.percent,
+            "memory_available_gb": vm.available * _GB,
+
             # Disk metrics
-            "disk_usage_percent": psutil.disk_usage('/').percent,
-            "disk_total_gb": round(psutil.disk_usage('/').total / (1024**3), 2),
-            "disk_used_gb": round(psutil.disk_usage('/').used / (1024**3), 2),
+            "disk_usage_percent": disk.percent,
+            "disk_used_gb": disk.used * _GB,
         }
         
-        # Try to get GPU info (requires additional libraries like pynvml)
-        telemetry["gpu_available"] = False
-        telemetry["gpu_count"] = 0
+        # GPU info via the handle cached in __init__ - no per-sample
+        # nvmlInit/nvmlShutdown cycle
+        telemetry["gpu_available"] = self._nvml is not None
+        telemetry["gpu_count"] = self._gpu_count
         telemetry["gpu_utilization"] = None
         telemetry["gpu_memory_used_gb"] = None
-        
-        try:
-            import pynvml
-            pynvml.nvmlInit()
-            gpu_count = pynvml.nvmlDeviceGetCount()
-            telemetry["gpu_available"] = True
-            telemetry["gpu_count"] = gpu_count
-            
-            if gpu_count > 0:
-                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                gpu_util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                gpu_mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                
+
+        if self._nvml_handle is not None:
+            try:
+                gpu_util = self._nvml.nvmlDeviceGetUtilizationRates(self._nvml_handle)
+                gpu_mem = self._nvml.nvmlDeviceGetMemoryInfo(self._nvml_handle)
+
                 telemetry["gpu_utilization"] = gpu_util.gpu
-                telemetry["gpu_memory_used_gb"] = round(gpu_mem.used / (1024**3), 2)
-                telemetry["gpu_memory_total_gb"] = round(gpu_mem.total / (1024**3), 2)
-            
-            pynvml.nvmlShutdown()
-        except (ImportError, Exception):
-            # GPU monitoring not available
-            pass
+                telemetry["gpu_memory_used_gb"] = gpu_mem.used * _GB
+                telemetry["gpu_memory_total_gb"] = gpu_mem.total * _GB
+            except Exception:
+                # GPU fell over mid-run - keep sampling CPU/memory
+                pass
         
         return telemetry
     
-    def start_tracking(self):
-        """Start tracking a workload."""
+    def start_tracking(self, sample_interval_s: Optional[float] = None):
+        """Start tracking a workload.
+
+        Args:
+            sample_interval_s: If set, sample telemetry every interval on a
+                daemon thread so the workload never blocks on sampling;
+                otherwise callers drive sampling via sample_telemetry()
+        """
         self.start_time = time.time()
+        self._mono_start = time.monotonic()
         self.telemetry_data = []
+        self._reset_stats()
+        # Prime the non-blocking CPU counter; the first sample may read 0.0
+        psutil.cpu_percent(interval=None)
         initial_telemetry = self.collect_telemetry()
-        self.telemetry_data.append(initial_telemetry)
+        self._record(initial_telemetry)
+
+        if sample_interval_s is not None:
+            self._stop_evt = threading.Event()
+
+            def _sample_loop():
+                while not self._stop_evt.wait(sample_interval_s):
+                    self._record(self.collect_telemetry())
+
+            self._sampler = threading.Thread(target=_sample_loop, daemon=True)
+            self._sampler.start()
+
         return initial_telemetry
-    
+
     def sample_telemetry(self):
         """Collect a telemetry sample during workload execution."""
         if self.start_time is None:
             raise RuntimeError("Tracking not started. Call start_tracking() first.")
-        
+
         telemetry = self.collect_telemetry()
-        self.telemetry_data.append(telemetry)
+        self._record(telemetry)
         return telemetry
     
     def stop_tracking(self) -> Dict:
@@ -271,22 +354,41 @@ class EmbodiedCarbonTracker:
         if self.start_time is None:
             raise RuntimeError("Tracking not started. Call start_tracking() first.")
         
+        # Stop the background sampler (if any) before the final sample so
+        # nothing mutates the aggregates while we read them
+        if self._sampler is not None:
+            self._stop_evt.set()
+            self._sampler.join()
+            self._sampler = None
+            self._stop_evt = None
+
+        # Monotonic diff for the duration (immune to NTP clock steps);
+        # wall time only for the human-readable timestamps
+        duration_s = time.monotonic() - self._mono_start
         end_time = time.time()
-        duration_s = end_time - self.start_time
         duration_h = duration_s / 3600.0
-        
+
         # Final telemetry
         final_telemetry = self.collect_telemetry()
-        self.telemetry_data.append(final_telemetry)
-        
+        self._record(final_telemetry)
+
         # Calculate embodied carbon
         total_embodied_carbon_kg = self.calculate_total_embodied_carbon()
         amortized_embodied_carbon_g = self.calculate_amortized_embodied_carbon(duration_h)
-        
-        # Aggregate telemetry statistics
-        cpu_usage = [t["cpu_percent"] for t in self.telemetry_data]
-        mem_usage = [t["memory_percent"] for t in self.telemetry_data]
-        
+
+        # Telemetry statistics come straight from the running aggregates
+        cpu, mem, mem_gb = self._stats["cpu"], self._stats["mem"], self._stats["mem_gb"]
+        n_samples = cpu[0]
+
+        # Deferred timestamp formatting: one pass here instead of a
+        # datetime allocation on every sample
+        wall_offset = self.start_time - self._mono_start
+        history = self.telemetry_data if self.keep_history else [final_telemetry]
+        for sample in history:
+            if "t" in sample:
+                sample["timestamp"] = datetime.fromtimestamp(
+                    wall_offset + sample.pop("t")).isoformat()
+
         result = {
             "timestamp_start": datetime.fromtimestamp(self.start_time).isoformat(),
             "timestamp_end": datetime.fromtimestamp(end_time).isoformat(),
@@ -297,82 +399,114 @@ class EmbodiedCarbonTracker:
             "instance_type": self.instance_type,
             "region": self.region,
             "specs": self.specs,
-            
+
+            # Per-process constants, reported once instead of per sample
+            "cpu_count_logical": self._cpu_logical,
+            "cpu_count_physical": self._cpu_physical,
+            "disk_total_gb": round(psutil.disk_usage('/').total * _GB, 2),
+
             # Embodied carbon
             "total_embodied_carbon_kg": total_embodied_carbon_kg,
             "amortized_embodied_carbon_g": amortized_embodied_carbon_g,
             
             # Telemetry statistics
-            "cpu_percent_avg": round(sum(cpu_usage) / len(cpu_usage), 2),
-            "cpu_percent_max": round(max(cpu_usage), 2),
-            "cpu_percent_min": round(min(cpu_usage), 2),
-            
-            "memory_percent_avg": round(sum(mem_usage) / len(mem_usage), 2),
-            "memory_percent_max": round(max(mem_usage), 2),
-            "memory_gb_avg": round(sum(t["memory_used_gb"] for t in self.telemetry_data) / len(self.telemetry_data), 2),
-            
-            "telemetry_samples": len(self.telemetry_data),
-            "telemetry_history": self.telemetry_data,
+            "cpu_percent_avg": round(cpu[1] / n_samples, 2),
+            "cpu_percent_max": round(cpu[3], 2),
+            "cpu_percent_min": round(cpu[2], 2),
+
+            "memory_percent_avg": round(mem[1] / n_samples, 2),
+            "memory_percent_max": round(mem[3], 2),
+            "memory_gb_avg": round(mem_gb[1] / n_samples, 2),
+
+            "telemetry_samples": n_samples,
+            # Without keep_history the final sample stands in so callers
+            # can still read e.g. history[-1]["gpu_available"]
+            "telemetry_history": history,
         }
         
         return result
 
 
-def estimate_total_carbon(duration_s: float, region: str = "Northern", 
-                         instance_type: str = "local_machine",
-                         operational_co2_g: Optional[float] = None) -> Dict:
-    """
-    Calculate total carbon emissions (operational + embodied).
-    
-    Args:
-        duration_s: Workload duration in seconds
-        region: Data center region
-        instance_type: Type of compute instance
-        operational_co2_g: Operational carbon from electricity (if already calculated)
-        
-    Returns:
-        Dictionary with complete carbon footprint breakdown
-    """
-    tracker = EmbodiedCarbonTracker(instance_type, region)
+# Shared trackers: construction (spec lookup + embodied precompute) is
+# amortized across the 1000+ per-task calls in experiments_large_scale.py
+_TRACKERS: Dict[Tuple[str, str], "EmbodiedCarbonTracker"] = {}
+
+
+def _get_tracker(instance_type: str, region: str) -> "EmbodiedCarbonTracker":
+    """Return the shared tracker for an (instance_type, region) pair."""
+    key = (instance_type, region)
+    tracker = _TRACKERS.get(key)
+    if tracker is None:
+        tracker = _TRACKERS.setdefault(key, EmbodiedCarbonTracker(instance_type, region))
+    return tracker
+
+
+@functools.lru_cache(maxsize=4096)
+def _carbon_breakdown(duration_s: float, region: str, instance_type: str,
+                      operational_co2_g: float) -> Dict:
+    """Memoized carbon breakdown for quantized inputs (treat as immutable)."""
+    tracker = _get_tracker(instance_type, region)
     duration_h = duration_s / 3600.0
-    
+
     # Calculate embodied carbon
     amortized_embodied_g = tracker.calculate_amortized_embodied_carbon(duration_h)
     total_embodied_kg = tracker.calculate_total_embodied_carbon()
-    
-    # If operational carbon not provided, estimate it
-    if operational_co2_g is None:
-        from estimator import estimate_co2
-        _, operational_co2_g = estimate_co2(duration_s, region)
-    
+
     # Total carbon
     total_co2_g = operational_co2_g + amortized_embodied_g
-    
+
     # Calculate percentages
     operational_percent = (operational_co2_g / total_co2_g * 100) if total_co2_g > 0 else 0
     embodied_percent = (amortized_embodied_g / total_co2_g * 100) if total_co2_g > 0 else 0
-    
+
     return {
         "duration_seconds": duration_s,
         "duration_hours": round(duration_h, 6),
         "region": region,
         "instance_type": instance_type,
-        
+
         # Carbon emissions (grams)
         "operational_co2_g": round(operational_co2_g, 6),
         "embodied_co2_g": round(amortized_embodied_g, 6),
         "total_co2_g": round(total_co2_g, 6),
-        
+
         # Percentages
         "operational_percent": round(operational_percent, 2),
         "embodied_percent": round(embodied_percent, 2),
-        
+
         # Hardware info
         "total_embodied_carbon_kg": total_embodied_kg,
         "specs": tracker.specs,
     }
 
 
+def estimate_total_carbon(duration_s: float, region: str = "Northern",
+                         instance_type: str = "local_machine",
+                         operational_co2_g: Optional[float] = None) -> Dict:
+    """
+    Calculate total carbon emissions (operational + embodied).
+
+    Args:
+        duration_s: Workload duration in seconds
+        region: Data center region
+        instance_type: Type of compute instance
+        operational_co2_g: Operational carbon from electricity (if already calculated)
+
+    Returns:
+        Dictionary with complete carbon footprint breakdown
+    """
+    # If operational carbon not provided, estimate it
+    if operational_co2_g is None:
+        from estimator import estimate_co2
+        _, operational_co2_g = estimate_co2(duration_s, region)
+
+    # Quantize the cache key - 1ms duration buckets and 6-decimal grams
+    # keep repeated near-identical tasks on the memoized path
+    cached = _carbon_breakdown(round(duration_s, 3), region, instance_type,
+                               round(operational_co2_g, 6))
+    return dict(cached)
+
+
 # =============================================================================
 # EXAMPLE USAGE
 # =============================================================================
@@ -1,14 +1,33 @@
-import requests, time, pandas as pd, os
+import requests, time, pandas as pd, numpy as np, os
 from datetime import datetime
 
 # Secure API key - use environment variable or fallback for testing
 API_KEY = os.environ.get("ELECTRICITYMAP_API_KEY", "XbTiaxd1H1KVBI4857Zx")
 ZONE_MAP = {"Northern":"IN-NO","Western":"IN-WE","Southern":"IN-SO","Eastern":"IN-EA"}
+# Keep-alive session: avoids a fresh TLS handshake on every TTL miss
+_SESSION = requests.Session()
+_SESSION.headers.update({"auth-token": API_KEY})
 _ci_cache = {}
 CACHE_TTL = 300
 PUE_DEFAULT = 1.2
 POWER_WATTS = 65
 
+# Optional numba acceleration for the vectorized path
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _co2_kernel(dur, rid, intens, pue, out_e, out_c):
+        # Fused single pass: no temporaries, parallel across cores
+        for i in prange(dur.size):
+            e = dur[i] * POWER_WATTS / 3.6e6
+            out_e[i] = e
+            out_c[i] = e * intens[rid[i]] * pue
+
 def get_live_ci(region):
     zone = ZONE_MAP.get(region)
     if not zone: return 700
@@ -16,9 +35,8 @@ def get_live_ci(region):
     if cached and time.time()-cached["ts"]<CACHE_TTL:
         return cached["ci"]
     try:
-        headers = {"auth-token":API_KEY}
         url = f"https://api.electricitymap.org/v3/carbon-intensity/latest?zone={zone}"
-        r = requests.get(url, headers=headers, timeout=5)
+        r = _SESSION.get(url, timeout=5)
         if r.status_code==200:
             ci = r.json().get("carbonIntensity")
             _ci_cache[region]={"ci":ci,"ts":time.time()}
@@ -27,25 +45,91 @@ def get_live_ci(region):
     except: pass
     return 700
 
+# region -> (mtime, ci): re-parse only when the CSV actually changes
+_hist_ci_cache = {}
+
 def get_recent_historical_ci(region):
-    """Fetch last recorded historical CI value."""
+    """Fetch last recorded historical CI value.
+
+    Only the final line is needed, so instead of a full pd.read_csv per
+    call the file tail is read directly and the value is cached against
+    the file's mtime.
+    """
     # Try both Data and data directories for compatibility
     for base_dir in ["Data", "data"]:
         file = os.path.join(base_dir, f"{region}.csv")
-        if os.path.exists(file):
-            df = pd.read_csv(file)
-            return df["carbon_intensity"].iloc[-1]
+        if not os.path.exists(file):
+            continue
+        mtime = os.stat(file).st_mtime
+        cached = _hist_ci_cache.get(region)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(file, "rb") as f:
+                header = f.readline().decode().rstrip("\r\n").split(",")
+                col = header.index("carbon_intensity")
+                f.seek(0, os.SEEK_END)
+                f.seek(max(f.tell() - 512, 0))
+                lines = [ln for ln in f.read().decode().splitlines() if ln.strip()]
+            ci = float(lines[-1].split(",")[col])
+        except (ValueError, IndexError, OSError):
+            return None
+        _hist_ci_cache[region] = (mtime, ci)
+        return ci
     return None
 
+_eff_ci_cache = {}
+
+def get_effective_ci(region, mode="hybrid"):
+    """Effective CI for a region (hybrid live/historical blend), cached per (region, mode)."""
+    cached = _eff_ci_cache.get((region, mode))
+    if cached and time.time()-cached["ts"] < CACHE_TTL:
+        return cached["ci"]
+    ci_live = get_live_ci(region)
+    ci_hist = get_recent_historical_ci(region) or ci_live
+    ci = (0.7*ci_live + 0.3*ci_hist) if mode=="hybrid" else ci_live
+    _eff_ci_cache[(region, mode)] = {"ci": ci, "ts": time.time()}
+    return ci
+
 def estimate_co2(duration_s, region="Northern", mode="hybrid"):
     """Compute CO₂ emission for workload."""
     duration_h = duration_s / 3600.0
     energy_kwh = (POWER_WATTS * duration_h) / 1000.0
-    ci_live = get_live_ci(region)
-    ci_hist = get_recent_historical_ci(region) or ci_live
-    ci = (0.7*ci_live + 0.3*ci_hist) if mode=="hybrid" else ci_live
+    ci = get_effective_ci(region, mode)
     co2_g = energy_kwh * ci * PUE_DEFAULT
     return round(energy_kwh,8), round(co2_g,6)
 
+def estimate_co2_vec(duration_s, region, mode="hybrid"):
+    """Vectorized estimate_co2: NumPy arrays in, NumPy arrays out.
+
+    Fetches CI once per unique region, then computes energy and CO₂ as
+    vectorized array ops instead of one Python call per row.
+    """
+    duration_s = np.asarray(duration_s, dtype=np.float64)
+    region = np.asarray(region)
+    intensity_map = {r: get_effective_ci(r, mode) for r in np.unique(region)}
+    if NUMBA_AVAILABLE:
+        # Integer-encode regions and run the fused jitted kernel
+        cat = pd.Categorical(region)
+        region_ids = cat.codes.astype(np.int32)
+        intens = np.array([intensity_map[r] for r in cat.categories], dtype=np.float64)
+        energy_kwh = np.empty_like(duration_s)
+        co2_g = np.empty_like(duration_s)
+        _co2_kernel(duration_s, region_ids, intens, PUE_DEFAULT, energy_kwh, co2_g)
+        return energy_kwh, co2_g
+    intensity = pd.Series(region).map(intensity_map).to_numpy(dtype=np.float64)
+    energy_kwh = duration_s * POWER_WATTS / 3.6e6
+    co2_g = energy_kwh * intensity * PUE_DEFAULT
+    return energy_kwh, co2_g
+
+def estimate_co2_batch(durations_s, region="Northern", mode="hybrid"):
+    """Batch estimate_co2 for many durations in one region.
+
+    Fetches CI once and computes energy/CO₂ for the whole array, so the
+    per-task HTTP and CSV lookups collapse to a single fetch.
+    """
+    durations_s = np.asarray(durations_s, dtype=np.float64)
+    return estimate_co2_vec(durations_s, np.full(durations_s.size, region), mode)
+
 if __name__ == "__main__":
     print(estimate_co2(2.5, "Southern"))
@@ -19,10 +19,12 @@ References:
 - Recent research showing traditional methods underprice new hardware by 25%
 """
 
+import functools
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import math
+import numpy as np
 from estimator import get_live_ci, get_recent_historical_ci
 
 # =============================================================================
@@ -102,10 +104,51 @@ PUE_DEFAULT = 1.2
 NEW_HARDWARE_CARBON_MULTIPLIER = 2.0
 
 
+# Optional numba acceleration for the scalar carbon math
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _njit_scalar(fn):
+    """JIT-compile a pure-scalar numeric helper when numba is available."""
+    return njit(cache=True)(fn) if NUMBA_AVAILABLE else fn
+
+
 # =============================================================================
 # CORE CALCULATION FUNCTIONS
 # =============================================================================
 
+@_njit_scalar
+def _power_core(base_power_w: float, age_years: float, alpha: float) -> float:
+    # Numeric core of calculate_power_consumption (njit-compatible)
+    degradation_factor = alpha * age_years
+    if degradation_factor > 0.60:  # Cap at 60% total increase
+        degradation_factor = 0.60
+    return base_power_w * (1 + degradation_factor)
+
+
+@_njit_scalar
+def _total_carbon_core(age_years: float, lifetime_years: float,
+                       embodied_kg: float, duration_seconds: float,
+                       carbon_intensity: float, alpha: float,
+                       pue: float, base_power_w: float):
+    # Fused numeric core of calculate_total_carbon: power degradation,
+    # operational carbon and debt-weighted embodied amortization in one
+    # compiled scalar pass
+    duration_hours = duration_seconds / 3600.0
+    power_w = _power_core(base_power_w, age_years, alpha)
+    operational_g = (power_w * duration_hours / 1000.0) * carbon_intensity * pue
+    debt_ratio = 0.0
+    if age_years < lifetime_years:
+        debt_ratio = (lifetime_years - age_years) / lifetime_years
+    lifetime_hours = lifetime_years * 365.25 * 24
+    embodied_g = (embodied_kg * 1000 / lifetime_hours) * duration_hours * debt_ratio
+    return operational_g, embodied_g, operational_g + embodied_g
+
+
 def calculate_carbon_debt_ratio(age_years: float, expected_lifetime_years: float) -> float:
     """
     Calculate remaining carbon debt ratio based on server age.
@@ -140,14 +183,12 @@ def calculate_power_consumption(base_power_w: float, age_years: float,
     Returns:
         Current power consumption in watts
     """
-    MAX_DEGRADATION = 0.60  # Cap at 60% total increase (research-backed)
-    degradation_factor = min(alpha * age_years, MAX_DEGRADATION)
-    actual_power = base_power_w * (1 + degradation_factor)
-    
+    actual_power = _power_core(base_power_w, age_years, alpha)
+
     # Assertion for validation
     assert actual_power <= base_power_w * 1.60, \
         f"Power {actual_power:.1f}W exceeds 60% cap for base {base_power_w}W"
-    
+
     return actual_power
 
 
@@ -224,11 +265,15 @@ def calculate_operational_carbon(power_w: float, duration_hours: float,
     return energy_kwh * carbon_intensity * pue
 
 
-def calculate_total_carbon(server_age: str, duration_seconds: float, 
+@functools.lru_cache(maxsize=1024)
+def calculate_total_carbon(server_age: str, duration_seconds: float,
                           carbon_intensity: float) -> Tuple[float, float, float]:
     """
     Calculate total carbon footprint (operational + embodied) for a server.
-    
+
+    Results are memoized per (server_age, duration, ci) - schedulers and
+    boundary sweeps re-evaluate the same few combinations many times.
+
     Args:
         server_age: Server age category ('new', 'medium', 'old')
         duration_seconds: Workload duration in seconds
@@ -238,33 +283,19 @@ def calculate_total_carbon(server_age: str, duration_seconds: float,
         Tuple of (operational_co2_g, embodied_co2_g, total_co2_g)
     """
     specs = SERVER_SPECS[server_age]
-    duration_hours = duration_seconds / 3600.0
-    
-    # Calculate current power consumption with degradation
-    # Use BASE_POWER_W (65W for new hardware), not specs["base_power_w"]
-    current_power_w = calculate_power_consumption(
-        BASE_POWER_W, 
-        specs["age_years"]
-    )
-    
-    # Operational carbon
-    operational_co2_g = calculate_operational_carbon(
-        current_power_w,
-        duration_hours,
-        carbon_intensity
-    )
-    
-    # Embodied carbon (amortized, considering debt)
-    embodied_co2_g = calculate_amortized_embodied_carbon(
-        specs["total_embodied_kg"],
+
+    # Single compiled scalar pass over the same formulas as the helpers
+    # above (uses BASE_POWER_W, 65W for new hardware)
+    return _total_carbon_core(
         specs["age_years"],
         specs["expected_lifetime_years"],
-        duration_hours
+        specs["total_embodied_kg"],
+        duration_seconds,
+        carbon_intensity,
+        EFFICIENCY_DEGRADATION_RATE,
+        PUE_DEFAULT,
+        BASE_POWER_W,
     )
-    
-    total_co2_g = operational_co2_g + embodied_co2_g
-    
-    return operational_co2_g, embodied_co2_g, total_co2_g
 
 
 def calculate_break_even_time(old_server_age: str, new_server_age: str,
@@ -324,24 +355,40 @@ def calculate_break_even_time(old_server_age: str, new_server_age: str,
 # EMBODIED CARBON-AWARE SCHEDULER
 # =============================================================================
 
-def choose_region_embodied_aware(duration_s: float, 
+# Age-group invariants for the candidate loop: debt ratio and degraded
+# power depend only on the static SERVER_SPECS, so evaluate them once at
+# import instead of per candidate on every scheduling call
+_AGE_DEBT_RATIO = {
+    age: calculate_carbon_debt_ratio(
+        specs["age_years"], specs["expected_lifetime_years"])
+    for age, specs in SERVER_SPECS.items()
+}
+_AGE_POWER_W = {
+    age: round(calculate_power_consumption(BASE_POWER_W, specs["age_years"]), 2)
+    for age, specs in SERVER_SPECS.items()
+}
+
+def choose_region_embodied_aware(duration_s: float,
                                 sla_ms: float = 2000,
                                 strategy: str = "embodied_prioritized",
-                                verbose: bool = False) -> Dict:
+                                verbose: bool = False,
+                                ci_override: Optional[float] = None) -> Dict:
     """
     Carbon-aware scheduler that prioritizes servers with paid-off embodied carbon.
-    
+
     Strategies:
         - "embodied_prioritized": Prefer older servers with lower carbon debt
         - "balanced": Balance operational and embodied carbon
         - "operational_only": Traditional approach (ignore embodied carbon age)
-    
+
     Args:
         duration_s: Expected workload duration in seconds
         sla_ms: Maximum acceptable latency in milliseconds
         strategy: Scheduling strategy
         verbose: Print detailed decision process
-        
+        ci_override: Fixed carbon intensity for all regions (skips the
+            live/historical lookups entirely - used by boundary sweeps)
+
     Returns:
         Dictionary with scheduling decision and carbon breakdown
     """
@@ -359,9 +406,12 @@ def choose_region_embodied_aware(duration_s: float,
             continue
         
         # Get carbon intensity
-        ci_live = get_live_ci(region) or 700
-        ci_hist = get_recent_historical_ci(region) or ci_live
-        ci = 0.7 * ci_live + 0.3 * ci_hist  # Hybrid
+        if ci_override is not None:
+            ci = ci_override
+        else:
+            ci_live = get_live_ci(region) or 700
+            ci_hist = get_recent_historical_ci(region) or ci_live
+            ci = 0.7 * ci_live + 0.3 * ci_hist  # Hybrid
         
         # Evaluate each server age group
         for server_age, server_info in dc_info["servers"].items():
@@ -373,12 +423,9 @@ def choose_region_embodied_aware(duration_s: float,
                 server_age, duration_s, ci
             )
             
-            # Get server specs for scoring
+            # Get server specs for scoring (debt ratio precomputed at import)
             specs = SERVER_SPECS[server_age]
-            debt_ratio = calculate_carbon_debt_ratio(
-                specs["age_years"],
-                specs["expected_lifetime_years"]
-            )
+            debt_ratio = _AGE_DEBT_RATIO[server_age]
             
             # Calculate score based on strategy
             if strategy == "embodied_prioritized":
@@ -413,8 +460,7 @@ def choose_region_embodied_aware(duration_s: float,
                 "embodied_co2_g": round(embodied_co2, 6),
                 "total_co2_g": round(total_co2, 6),
                 "carbon_debt_ratio": round(debt_ratio, 3),
-                "power_consumption_w": round(calculate_power_consumption(
-                    BASE_POWER_W, specs["age_years"]), 2),
+                "power_consumption_w": _AGE_POWER_W[server_age],
                 "latency_ms": latency,
                 "cost_factor": cost,
                 "score": round(score, 6),
@@ -468,7 +514,101 @@ def choose_region_embodied_aware(duration_s: float,
     return best_choice
 
 
-def analyze_hardware_replacement(region: str, old_age: str = "old", 
+def choose_region_embodied_aware_batch(durations_s, sla_ms,
+                                       strategy: str = "embodied_prioritized",
+                                       ci_override: Optional[float] = None) -> Dict:
+    """
+    Vectorized scheduler: NumPy arrays of durations/SLAs in, dict of
+    NumPy arrays out.
+
+    Fetches CI once per region, builds the (candidate x task) score
+    matrix with broadcasting and argmins over candidates - one call
+    replaces one Python scheduler invocation per task. Scores and carbon
+    formulas match choose_region_embodied_aware exactly (minus the
+    cosmetic per-field rounding).
+    """
+    durations_s = np.asarray(durations_s, dtype=np.float64)
+    sla_ms = np.asarray(sla_ms, dtype=np.float64)
+
+    # Per-candidate constants (one row per region x available age group)
+    cand = []
+    for region, dc_info in REGION_DATACENTERS.items():
+        if ci_override is not None:
+            ci = ci_override
+        else:
+            ci_live = get_live_ci(region) or 700
+            ci_hist = get_recent_historical_ci(region) or ci_live
+            ci = 0.7 * ci_live + 0.3 * ci_hist  # Hybrid
+        for server_age, server_info in dc_info["servers"].items():
+            if server_info["available"] <= 0:
+                continue
+            specs = SERVER_SPECS[server_age]
+            power_w = _power_core(BASE_POWER_W, specs["age_years"],
+                                  EFFICIENCY_DEGRADATION_RATE)
+            lifetime_hours = specs["expected_lifetime_years"] * 365.25 * 24
+            cand.append((
+                region, server_age, specs["age_years"], ci,
+                dc_info["latency_ms"], dc_info["cost_factor"],
+                _AGE_DEBT_RATIO[server_age], power_w,
+                # g CO₂ per hour of runtime, operational and embodied
+                (power_w / 1000.0) * ci * PUE_DEFAULT,
+                (specs["total_embodied_kg"] * 1000 / lifetime_hours) *
+                _AGE_DEBT_RATIO[server_age],
+            ))
+
+    regions = np.array([c[0] for c in cand])
+    ages = np.array([c[1] for c in cand])
+    age_years = np.array([c[2] for c in cand])
+    cis = np.array([c[3] for c in cand])
+    latencies = np.array([c[4] for c in cand], dtype=np.float64)
+    costs = np.array([c[5] for c in cand])
+    debts = np.array([c[6] for c in cand])
+    powers = np.array([c[7] for c in cand])
+    op_per_hour = np.array([c[8] for c in cand])
+    emb_per_hour = np.array([c[9] for c in cand])
+
+    # (candidate, task) carbon matrices
+    dur_h = durations_s / 3600.0
+    operational = op_per_hour[:, None] * dur_h[None, :]
+    embodied = emb_per_hour[:, None] * dur_h[None, :]
+    total = operational + embodied
+
+    lat_term = (latencies / 1000.0)[:, None]
+    cost_term = costs[:, None]
+    if strategy == "embodied_prioritized":
+        score = (0.4 * total + 0.3 * (debts[:, None] * 1000) +
+                 0.2 * lat_term + 0.1 * cost_term)
+    elif strategy == "balanced":
+        score = (0.35 * operational + 0.35 * embodied +
+                 0.2 * lat_term + 0.1 * cost_term)
+    else:  # "operational_only"
+        score = 0.7 * operational + 0.2 * lat_term + 0.1 * cost_term
+
+    # SLA constraint: knock out too-slow candidates per task
+    score = np.where(latencies[:, None] > sla_ms[None, :], np.inf, score)
+    best = score.argmin(axis=0)
+
+    idx = np.arange(durations_s.size)
+    return {
+        "region": regions[best],
+        "server_age": ages[best],
+        "server_age_years": age_years[best],
+        "carbon_intensity": cis[best],
+        "operational_co2_g": operational[best, idx],
+        "embodied_co2_g": embodied[best, idx],
+        "total_co2_g": total[best, idx],
+        "carbon_debt_ratio": debts[best],
+        "power_consumption_w": powers[best],
+        "latency_ms": latencies[best],
+        "cost_factor": costs[best],
+        "score": score[best, idx],
+        "strategy": strategy,
+        "duration_s": durations_s,
+        "sla_ms": sla_ms,
+    }
+
+
+def analyze_hardware_replacement(region: str, old_age: str = "old",
                                  new_age: str = "new") -> Dict:
     """
     Analyze whether replacing old servers with new ones is carbon-beneficial.